@@ -27,7 +27,7 @@ def run_analyze(args: Any) -> None:
         result = analyzer.analyze_dfg_file(args.dfg_file)
         
         # 生成报告
-        report_gen = ReportGenerator(args.output)
+        report_gen = ReportGenerator(args.output, compact_json=getattr(args, 'compact_json', False))
         
         if args.format in ['txt', 'both']:
             txt_file = report_gen.generate_text_report(result, "linearity_analysis.txt")
@@ -3,15 +3,39 @@
 批量分析命令
 """
 
+import contextlib
+import io
 import os
 import sys
-from typing import Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+def _analyze_one(dfg_file: str, output_dir: str, quiet: bool = False) -> Tuple[Optional[Dict], Optional[str]]:
+    """分析单个DFG文件并写出其文本报告，返回 (result, error)
+
+    每个文件使用独立的分析器实例，可在子进程中运行；quiet=True 时屏蔽分析器自身的进度输出，
+    避免多进程输出交错。
+    """
+    from esimulator.core.linearity_analyzer import LinearityAnalyzer
+    from esimulator.core.report_generator import ReportGenerator
+    
+    try:
+        with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+            result = LinearityAnalyzer().analyze_dfg_file(dfg_file)
+        
+        # 生成单独报告
+        output_name = f"{os.path.splitext(os.path.basename(dfg_file))[0]}_analysis.txt"
+        ReportGenerator(output_dir).generate_text_report(result, output_name)
+        return result, None
+    except Exception as e:
+        return None, str(e)
 
 def run_batch(args: Any) -> None:
     """执行批量分析"""
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
     
-    from esimulator.core.linearity_analyzer import LinearityAnalyzer
     from esimulator.core.report_generator import ReportGenerator
     
     if not os.path.exists(args.input_dir):
@@ -31,31 +55,39 @@ def run_batch(args: Any) -> None:
     print(f"批量分析 {len(dfg_files)} 个DFG文件")
     print("=" * 50)
     
-    analyzer = LinearityAnalyzer()
     report_gen = ReportGenerator(args.output)
     
     all_results = {}
     
-    for dfg_file in dfg_files:
-        filename = os.path.basename(dfg_file)
-        print(f"\n正在分析: {filename}")
-        
-        try:
-            result = analyzer.analyze_dfg_file(dfg_file)
+    # 各文件相互独立：jobs>1 时用进程池并行分析，结果仍按文件顺序汇总输出
+    jobs = getattr(args, 'jobs', 1) or os.cpu_count() or 1
+    jobs = min(jobs, len(dfg_files))
+    if jobs > 1:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        outcomes = executor.map(_analyze_one, dfg_files, [args.output] * len(dfg_files), [True] * len(dfg_files))
+    else:
+        executor = None
+        outcomes = (_analyze_one(dfg_file, args.output) for dfg_file in dfg_files)
+    
+    try:
+        for dfg_file in dfg_files:
+            filename = os.path.basename(dfg_file)
+            print(f"\n正在分析: {filename}")
+            result, error = next(outcomes)
+            
+            if error is not None:
+                print(f"  分析失败: {error}")
+                continue
+            
             all_results[filename] = result
             
             summary = result['summary']
             print(f"  线性度: {summary['linearity_ratio']:.1%}")
             print(f"  总信号: {summary['total_expressions']}")
             print(f"  线性信号: {summary['linear_expressions']}")
-            
-            # 生成单独报告
-            output_name = f"{os.path.splitext(filename)[0]}_analysis.txt"
-            report_gen.generate_text_report(result, output_name)
-            
-        except Exception as e:
-            print(f"  分析失败: {e}")
-            continue
+    finally:
+        if executor is not None:
+            executor.shutdown()
     
     # 生成汇总报告
     if all_results:
@@ -66,27 +98,30 @@ def generate_batch_summary(all_results: dict, report_gen) -> None:
     """生成批量分析汇总报告"""
     summary_file = os.path.join(report_gen.output_dir, "batch_summary.txt")
     
-    with open(summary_file, 'w', encoding='utf-8') as f:
-        f.write("批量DFG线性分析汇总报告\n")
-        f.write("=" * 40 + "\n\n")
-        
-        f.write(f"分析文件数: {len(all_results)}\n\n")
-        
-        f.write("各文件分析结果:\n")
-        f.write("-" * 20 + "\n")
-        
-        total_expressions = 0
-        total_linear = 0
-        
-        for filename, result in all_results.items():
-            summary = result['summary']
-            total_expressions += summary['total_expressions']
-            total_linear += summary['linear_expressions']
-            
-            f.write(f"{filename:<25}: {summary['linearity_ratio']:>6.1%} "
-                   f"({summary['linear_expressions']}/{summary['total_expressions']})\n")
+    lines = [
+        "批量DFG线性分析汇总报告\n",
+        "=" * 40 + "\n\n",
+        f"分析文件数: {len(all_results)}\n\n",
+        "各文件分析结果:\n",
+        "-" * 20 + "\n",
+    ]
+    
+    total_expressions = 0
+    total_linear = 0
+    
+    for filename, result in all_results.items():
+        summary = result['summary']
+        total_expressions += summary['total_expressions']
+        total_linear += summary['linear_expressions']
         
-        overall_linearity = total_linear / total_expressions if total_expressions > 0 else 0
-        f.write(f"\n总体线性度: {overall_linearity:.1%} ({total_linear}/{total_expressions})\n")
+        lines.append(f"{filename:<25}: {summary['linearity_ratio']:>6.1%} "
+                     f"({summary['linear_expressions']}/{summary['total_expressions']})\n")
+    
+    overall_linearity = total_linear / total_expressions if total_expressions > 0 else 0
+    lines.append(f"\n总体线性度: {overall_linearity:.1%} ({total_linear}/{total_expressions})\n")
+    
+    # 汇总内容拼好后一次写入
+    with open(summary_file, 'w', encoding='utf-8') as f:
+        f.write("".join(lines))
     
     print(f"汇总报告已保存到: {summary_file}")
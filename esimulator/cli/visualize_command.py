@@ -17,6 +17,7 @@ def run_visualize(args: Any) -> None:
         return
 
     out_dir = args.output
+    render = getattr(args, 'render', 'none')
     os.makedirs(out_dir, exist_ok=True)
 
     print(f"生成可视化 (DOT/HTML): {args.dfg_file}")
@@ -32,10 +33,16 @@ def run_visualize(args: Any) -> None:
             keep=getattr(args, 'filter', None),
             html=True,
             dot=True,
+            png=render == 'graphviz',
         )
         print(f"已输出: {out_dir}")
         print("指标: ", res['metrics'])
-        print("提示: 使用 graphviz 可将 dot 转为 png: dot -Tpng <file>.dot -o <file>.png")
+        if res['png']:
+            print(f"PNG 已渲染: {res['png']}")
+        elif render == 'graphviz':
+            print("警告: 未找到 graphviz 的 dot 命令或渲染失败，已跳过 PNG")
+        else:
+            print("提示: 使用 graphviz 可将 dot 转为 png: dot -Tpng <file>.dot -o <file>.png")
     except Exception as e:
         print(f"可视化过程中出错: {e}")
         sys.exit(1)
@@ -3,31 +3,66 @@
 DFG解析器模块
 """
 
+import io
 import re
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 预编译的模式，避免每次调用时经 re 模块缓存查找
+_OPERATOR_RE = re.compile(r'\(Operator (\w+) Next:')
+
+_BIND_PREFIX = '(Bind dest:'
+
+# 表达式首字母 -> (前缀, 表达式类型)，按单个字符分派代替逐个 startswith
+_EXPRESSION_TYPES = {
+    'T': ('(Terminal ', 'terminal'),
+    'I': ('(IntConst ', 'constant'),
+    'B': ('(Branch ', 'branch'),
+    'C': ('(Concat ', 'concat'),
+    'O': ('(Operator ', 'operator'),
+}
+
+def parse_bind_line(raw: str) -> Optional[Tuple[str, str]]:
+    """解析单行Bind，返回(目标信号, 表达式树)；不是完整的Bind行时返回None"""
+    line = raw.strip()
+    if not line.startswith(_BIND_PREFIX) or not line.endswith(')'):
+        return None
+    
+    parts = line[len(_BIND_PREFIX):].split(None, 1)
+    if len(parts) < 2:
+        return None
+    dest, rest = parts
+    tree_start = rest.find('tree:')
+    if tree_start < 0:
+        return None
+    
+    return dest, rest[tree_start + 5:-1].strip()
+
+def iter_binds(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """逐行提取Bind的(目标信号, 表达式树)，重复的目标信号会被逐一产出"""
+    for raw in lines:
+        bind = parse_bind_line(raw)
+        if bind is not None:
+            yield bind
 
 class DFGParser:
     """DFG文件解析器"""
     
     def __init__(self):
-        self.bind_pattern = r'\(Bind dest:([^\s]+).*?tree:(.*?)\)(?=\n\(Bind|\nBranch:|\n\n|\Z)'
         self.parsed_signals = {}
     
     def parse_file(self, file_path: str) -> Dict:
         """解析DFG文件"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        return self.parse_content(content)
+        with open(file_path, 'r', encoding='utf-8', buffering=1 << 20) as f:
+            return self.parse_stream(f)
     
     def parse_content(self, content: str) -> Dict:
         """解析DFG内容"""
-        matches = list(re.finditer(self.bind_pattern, content, re.DOTALL))
-        
+        return self.parse_stream(io.StringIO(content))
+    
+    def parse_stream(self, stream: Iterable[str]) -> Dict:
+        """逐行解析DFG内容，避免整文件读入内存"""
         signals = {}
-        for match in matches:
-            signal_name = match.group(1)
-            tree_expr = match.group(2).strip()
+        for signal_name, tree_expr in iter_binds(stream):
             signals[signal_name] = tree_expr
         
         self.parsed_signals = signals
@@ -47,20 +82,11 @@ class DFGParser:
     
     def extract_operators(self, expression: str) -> List[str]:
         """从表达式中提取运算符"""
-        operator_pattern = r'\(Operator (\w+) Next:'
-        return re.findall(operator_pattern, expression)
+        return _OPERATOR_RE.findall(expression)
     
     def get_expression_type(self, expression: str) -> str:
         """获取表达式类型"""
-        if expression.startswith('(Terminal '):
-            return 'terminal'
-        elif expression.startswith('(IntConst '):
-            return 'constant'
-        elif expression.startswith('(Branch '):
-            return 'branch'
-        elif expression.startswith('(Concat '):
-            return 'concat'
-        elif expression.startswith('(Operator '):
-            return 'operator'
-        else:
-            return 'unknown'
+        entry = _EXPRESSION_TYPES.get(expression[1:2])
+        if entry is not None and expression.startswith(entry[0]):
+            return entry[1]
+        return 'unknown'
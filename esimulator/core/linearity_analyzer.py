@@ -4,11 +4,22 @@ DFG表达式分析和修正方案
 基于实际的4004 DFG文件内容设计正确的线性分析方法
 """
 
+import heapq
 import re
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import Dict, List, Set, Tuple, Optional, Union
-import json
+from typing import Dict, List, Optional
+
+try:
+    from .dfg_parser import iter_binds
+except ImportError:
+    # 作为脚本直接运行时回退到同目录导入
+    from dfg_parser import iter_binds
+
+_OPERATOR_RE = re.compile(r'\(Operator (\w+) Next:')
+
+# 单次扫描同时识别运算符节点与条件分支节点（编译后由正则引擎按状态机一次走完）
+_OPERATOR_OR_BRANCH_RE = re.compile(r'\(Operator (\w+) Next:|\(Branch ')
 
 @dataclass
 class ExpressionNode:
@@ -54,8 +65,9 @@ class LinearityAnalyzer:
     def analyze_dfg_file(self, file_path: str) -> Dict:
         """分析DFG文件，按表达式级别进行线性分析"""
         
+        # 逐行提取所有Bind表达式
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+            binds = list(iter_binds(f))
         
         print("=== 修正的DFG线性分析 ===")
         print("修正策略:")
@@ -64,18 +76,11 @@ class LinearityAnalyzer:
         print("3. 整体判断表达式线性特征")
         print("4. 重新分类位移运算为非线性\n")
         
-        # 提取所有Bind表达式
-        bind_pattern = r'\(Bind dest:([^\s]+).*?tree:(.*?)\)(?=\n\(Bind|\nBranch:|\n\n|\Z)'
-        matches = list(re.finditer(bind_pattern, content, re.DOTALL))
-        
-        self.total_expressions = len(matches)
+        self.total_expressions = len(binds)
         print(f"找到 {self.total_expressions} 个信号表达式")
         
         # 分析每个表达式
-        for match in matches:
-            signal_name = match.group(1)
-            tree_expr = match.group(2).strip()
-            
+        for signal_name, tree_expr in binds:
             try:
                 analysis = self._analyze_signal_expression(signal_name, tree_expr)
                 self.signal_analyses[signal_name] = analysis
@@ -94,8 +99,10 @@ class LinearityAnalyzer:
     def _analyze_signal_expression(self, signal_name: str, tree_expr: str) -> Dict:
         """分析单个信号表达式"""
         
-        # 检测表达式类型
-        if tree_expr.startswith('(Terminal '):
+        # 按 '(' 后的首字母分派表达式类型，只需校验一个候选前缀
+        kind = tree_expr[1:2]
+        
+        if kind == 'T' and tree_expr.startswith('(Terminal '):
             # 直接终端赋值 - 线性
             return {
                 'is_linear': True,
@@ -105,7 +112,7 @@ class LinearityAnalyzer:
                 'expression_type': 'terminal'
             }
         
-        elif tree_expr.startswith('(IntConst ') or tree_expr.startswith('(IntCon '):
+        elif kind == 'I' and tree_expr.startswith(('(IntConst ', '(IntCon ')):
             # 常量赋值 - 线性
             return {
                 'is_linear': True,
@@ -115,15 +122,15 @@ class LinearityAnalyzer:
                 'expression_type': 'constant'
             }
         
-        elif tree_expr.startswith('(Branch '):
+        elif kind == 'B' and tree_expr.startswith('(Branch '):
             # 分支表达式 - 通常非线性
             return self._analyze_branch_expression(tree_expr)
         
-        elif tree_expr.startswith('(Concat '):
+        elif kind == 'C' and tree_expr.startswith('(Concat '):
             # 拼接表达式 - 需要检查子表达式
             return self._analyze_concat_expression(tree_expr)
         
-        elif tree_expr.startswith('(Operator '):
+        elif kind == 'O' and tree_expr.startswith('(Operator '):
             # 运算符表达式 - 递归分析
             return self._analyze_operator_expression(tree_expr)
         
@@ -143,13 +150,14 @@ class LinearityAnalyzer:
         operators_found = []
         is_linear = True
         nonlinear_reason = None
+        has_branch = False
         
-        # 提取所有运算符
-        operator_pattern = r'\(Operator (\w+) Next:'
-        matches = list(re.finditer(operator_pattern, expr))
-        
-        for match in matches:
+        # 一次扫描提取所有运算符，并顺带检查是否包含Branch（条件分支）
+        for match in _OPERATOR_OR_BRANCH_RE.finditer(expr):
             operator = match.group(1)
+            if operator is None:
+                has_branch = True
+                continue
             operators_found.append(operator)
             
             if operator in self.nonlinear_operators:
@@ -157,8 +165,7 @@ class LinearityAnalyzer:
                 if nonlinear_reason is None:
                     nonlinear_reason = f'包含非线性运算符: {operator}'
         
-        # 检查是否包含Branch（条件分支）
-        if '(Branch ' in expr:
+        if has_branch:
             is_linear = False
             if nonlinear_reason is None:
                 nonlinear_reason = '包含条件分支'
@@ -186,8 +193,7 @@ class LinearityAnalyzer:
         """分析分支表达式"""
         
         # 分支表达式本质上是非线性的（多项式逻辑）
-        operator_pattern = r'\(Operator (\w+) Next:'
-        operators = re.findall(operator_pattern, expr)
+        operators = _OPERATOR_RE.findall(expr) if '(Operator ' in expr else []
         
         return {
             'is_linear': False,
@@ -201,8 +207,7 @@ class LinearityAnalyzer:
         """分析拼接表达式"""
         
         # 拼接本身是线性的，但需要检查子表达式
-        operator_pattern = r'\(Operator (\w+) Next:'
-        operators = re.findall(operator_pattern, expr)
+        operators = _OPERATOR_RE.findall(expr) if '(Operator ' in expr else []
         
         # 如果包含非线性运算符，整体非线性
         is_linear = True
@@ -224,32 +229,28 @@ class LinearityAnalyzer:
     def _generate_comprehensive_report(self) -> Dict:
         """生成全面的分析报告"""
         
-        # 统计线性/非线性表达式
-        linear_count = sum(1 for analysis in self.signal_analyses.values() 
-                          if analysis['is_linear'])
-        nonlinear_count = self.total_expressions - linear_count
-        
-        # 按复杂度分类
+        # 单次遍历完成线性计数、复杂度/类型分布、非线性原因与运算符使用统计
+        linear_count = 0
         complexity_stats = defaultdict(int)
         expression_type_stats = defaultdict(int)
-        
-        # 统计各类非线性原因
         nonlinear_reasons = defaultdict(int)
+        operator_usage = defaultdict(int)
         
         for signal, analysis in self.signal_analyses.items():
             complexity_stats[analysis['complexity']] += 1
             expression_type_stats[analysis['expression_type']] += 1
             
-            if not analysis['is_linear']:
+            if analysis['is_linear']:
+                linear_count += 1
+            else:
                 reason = analysis['reason'].split(':')[0] if ':' in analysis['reason'] else analysis['reason']
                 nonlinear_reasons[reason] += 1
-        
-        # 运算符使用统计
-        operator_usage = defaultdict(int)
-        for analysis in self.signal_analyses.values():
+            
             for op in analysis['operators']:
                 operator_usage[op] += 1
         
+        nonlinear_count = self.total_expressions - linear_count
+        
         return {
             'summary': {
                 'total_expressions': self.total_expressions,
@@ -337,8 +338,8 @@ def analyze_real_dfg():
         print(f"  {reason}: {count}")
     
     print(f"\n运算符使用统计（前10位）:")
-    sorted_ops = sorted(report['operator_usage'].items(), key=lambda x: x[1], reverse=True)
-    for op, count in sorted_ops[:10]:
+    sorted_ops = heapq.nlargest(10, report['operator_usage'].items(), key=lambda x: x[1])
+    for op, count in sorted_ops:
         op_type = "线性" if op in analyzer.linear_operators else "非线性"
         print(f"  {op} ({op_type}): {count}")
     
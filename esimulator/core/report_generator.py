@@ -3,6 +3,7 @@
 报告生成器模块
 """
 
+import heapq
 import json
 import os
 from datetime import datetime
@@ -11,10 +12,18 @@ from typing import Dict, Any
 class ReportGenerator:
     """分析报告生成器"""
     
-    def __init__(self, output_dir: str = "results"):
+    def __init__(self, output_dir: str = "results", compact_json: bool = False):
         self.output_dir = output_dir
+        # compact_json=True 时 JSON 输出去掉缩进与多余空白，适合大批量/机器读取
+        self.compact_json = compact_json
         os.makedirs(output_dir, exist_ok=True)
     
+    def _json_format_options(self) -> Dict[str, Any]:
+        """json.dump 的格式参数：默认缩进便于阅读，紧凑模式使用最短分隔符"""
+        if self.compact_json:
+            return {'separators': (',', ':')}
+        return {'indent': 2}
+    
     def generate_text_report(self, analysis_result: Dict[Any, Any], filename: str = None) -> str:
         """生成文本格式报告"""
         if filename is None:
@@ -23,56 +32,61 @@ class ReportGenerator:
         
         filepath = os.path.join(self.output_dir, filename)
         
+        summary = analysis_result.get('summary', {})
+        # 分布百分比的分母与线性度在各段中复用，只取一次
+        total = summary.get('total_expressions', 1)
+        linearity_ratio = summary.get('linearity_ratio', 0)
+        
+        # 先在列表中拼好各行，最后一次性写入文件
+        lines = [
+            "ESIMULATOR DFG线性分析报告\n",
+            "=" * 50 + "\n\n",
+            f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+            "分析摘要:\n",
+            "-" * 15 + "\n",
+            f"总表达式数: {summary.get('total_expressions', 0)}\n",
+            f"线性表达式: {summary.get('linear_expressions', 0)} ({linearity_ratio:.1%})\n",
+            f"非线性表达式: {summary.get('nonlinear_expressions', 0)} ({1-linearity_ratio:.1%})\n\n",
+        ]
+        
+        # 表达式类型分布
+        type_dist = analysis_result.get('expression_type_distribution', {})
+        if type_dist:
+            lines.append("表达式类型分布:\n")
+            lines.append("-" * 20 + "\n")
+            lines.extend(f"{expr_type:<15}: {count:>3} ({count / total * 100:>5.1f}%)\n"
+                         for expr_type, count in type_dist.items())
+            lines.append("\n")
+        
+        # 复杂度分布
+        complexity_dist = analysis_result.get('complexity_distribution', {})
+        if complexity_dist:
+            lines.append("复杂度分布:\n")
+            lines.append("-" * 15 + "\n")
+            lines.extend(f"{complexity:<10}: {count:>3} ({count / total * 100:>5.1f}%)\n"
+                         for complexity, count in complexity_dist.items())
+            lines.append("\n")
+        
+        # 非线性原因分析
+        nonlinear_reasons = analysis_result.get('nonlinear_reasons', {})
+        if nonlinear_reasons:
+            lines.append("非线性原因分析:\n")
+            lines.append("-" * 20 + "\n")
+            lines.extend(f"{reason}: {count}\n" for reason, count in nonlinear_reasons.items())
+            lines.append("\n")
+        
+        # 详细信号分析
+        detailed = analysis_result.get('detailed_analyses', {})
+        if detailed:
+            lines.append("详细信号分析:\n")
+            lines.append("-" * 20 + "\n")
+            lines.extend(
+                f"{signal:<20}: {'线性' if analysis.get('is_linear') else '非线性':<6} - {analysis.get('reason', '未知')}\n"
+                for signal, analysis in sorted(detailed.items())
+            )
+        
         with open(filepath, 'w', encoding='utf-8') as f:
-            f.write("ESIMULATOR DFG线性分析报告\n")
-            f.write("=" * 50 + "\n\n")
-            f.write(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            
-            summary = analysis_result.get('summary', {})
-            f.write("分析摘要:\n")
-            f.write("-" * 15 + "\n")
-            f.write(f"总表达式数: {summary.get('total_expressions', 0)}\n")
-            f.write(f"线性表达式: {summary.get('linear_expressions', 0)} ({summary.get('linearity_ratio', 0):.1%})\n")
-            f.write(f"非线性表达式: {summary.get('nonlinear_expressions', 0)} ({1-summary.get('linearity_ratio', 0):.1%})\n\n")
-            
-            # 表达式类型分布
-            type_dist = analysis_result.get('expression_type_distribution', {})
-            if type_dist:
-                f.write("表达式类型分布:\n")
-                f.write("-" * 20 + "\n")
-                for expr_type, count in type_dist.items():
-                    percentage = count / summary.get('total_expressions', 1) * 100
-                    f.write(f"{expr_type:<15}: {count:>3} ({percentage:>5.1f}%)\n")
-                f.write("\n")
-            
-            # 复杂度分布
-            complexity_dist = analysis_result.get('complexity_distribution', {})
-            if complexity_dist:
-                f.write("复杂度分布:\n")
-                f.write("-" * 15 + "\n")
-                for complexity, count in complexity_dist.items():
-                    percentage = count / summary.get('total_expressions', 1) * 100
-                    f.write(f"{complexity:<10}: {count:>3} ({percentage:>5.1f}%)\n")
-                f.write("\n")
-            
-            # 非线性原因分析
-            nonlinear_reasons = analysis_result.get('nonlinear_reasons', {})
-            if nonlinear_reasons:
-                f.write("非线性原因分析:\n")
-                f.write("-" * 20 + "\n")
-                for reason, count in nonlinear_reasons.items():
-                    f.write(f"{reason}: {count}\n")
-                f.write("\n")
-            
-            # 详细信号分析
-            detailed = analysis_result.get('detailed_analyses', {})
-            if detailed:
-                f.write("详细信号分析:\n")
-                f.write("-" * 20 + "\n")
-                for signal, analysis in sorted(detailed.items()):
-                    linearity = "线性" if analysis.get('is_linear') else "非线性"
-                    reason = analysis.get('reason', '未知')
-                    f.write(f"{signal:<20}: {linearity:<6} - {reason}\n")
+            f.write("".join(lines))
         
         return filepath
     
@@ -95,7 +109,7 @@ class ReportGenerator:
         }
         
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
+            json.dump(report_data, f, ensure_ascii=False, **self._json_format_options())
         
         return filepath
     
@@ -114,8 +128,8 @@ DFG线性分析摘要
 """
         
         nonlinear_reasons = analysis_result.get('nonlinear_reasons', {})
-        for reason, count in sorted(nonlinear_reasons.items(), key=lambda x: x[1], reverse=True)[:3]:
-            report += f"- {reason}: {count}个\n"
+        top_reasons = heapq.nlargest(3, nonlinear_reasons.items(), key=lambda x: x[1])
+        report += "".join(f"- {reason}: {count}个\n" for reason, count in top_reasons)
         
         return report.strip()
     
@@ -124,6 +138,6 @@ DFG线性分析摘要
         filepath = os.path.join(self.output_dir, filename)
         
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(analysis_result, f, indent=2, ensure_ascii=False)
+            json.dump(analysis_result, f, ensure_ascii=False, **self._json_format_options())
         
         return filepath
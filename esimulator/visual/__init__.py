@@ -1,9 +1,10 @@
 """可视化子包: 包含 DFG 线性/非线性交互可视化与 DOT 输出逻辑"""
-from .dfg_visual import build_graph_data, write_dot, write_interactive_html, visualize_from_dfg
+from .dfg_visual import build_graph_data, write_dot, write_interactive_html, render_png, visualize_from_dfg
 
 __all__ = [
     'build_graph_data',
     'write_dot',
     'write_interactive_html',
+    'render_png',
     'visualize_from_dfg'
 ]
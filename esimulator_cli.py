@@ -11,6 +11,16 @@ import os
 # 添加src目录到路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'esimulator'))
 
+def _non_negative_int(value: str) -> int:
+    """argparse 类型：非负整数"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"需要整数: {value}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"不能为负数: {value}")
+    return number
+
 def main():
     parser = argparse.ArgumentParser(description='ESIMULATOR - DFG线性分析工具')
     subparsers = parser.add_subparsers(dest='command', help='可用命令')
@@ -20,6 +30,7 @@ def main():
     linearity_parser.add_argument('dfg_file', help='DFG文件路径')
     linearity_parser.add_argument('--output', '-o', help='输出目录', default='results')
     linearity_parser.add_argument('--format', choices=['txt', 'json', 'both'], default='txt', help='输出格式')
+    linearity_parser.add_argument('--compact-json', action='store_true', help='JSON报告使用紧凑格式 (无缩进)')
     
     # 对比分析命令
     compare_parser = subparsers.add_parser('compare', help='对比分析方法')
@@ -29,6 +40,7 @@ def main():
     batch_parser = subparsers.add_parser('batch', help='批量分析多个DFG文件')
     batch_parser.add_argument('input_dir', help='包含DFG文件的目录')
     batch_parser.add_argument('--output', '-o', help='输出目录', default='results')
+    batch_parser.add_argument('--jobs', '-j', type=_non_negative_int, default=1, help='并行分析的进程数 (默认1，0表示使用全部CPU)')
     
     # 可视化命令
     viz_parser = subparsers.add_parser('visualize', help='生成可视化图表 (DOT + HTML)')
@@ -37,6 +49,7 @@ def main():
     viz_parser.add_argument('--filter', choices=['linear','nonlinear'], help='过滤仅显示线性或非线性节点')
     viz_parser.add_argument('--focus', help='以某个信号为根聚焦子图')
     viz_parser.add_argument('--depth', type=int, default=2, help='聚焦子图向前深度 (默认2)')
+    viz_parser.add_argument('--render', choices=['none', 'graphviz'], default='none', help='PNG 渲染方式 (graphviz: 调用 dot -Tpng)')
     
     args = parser.parse_args()
     
@@ -4,11 +4,13 @@ DFG表达式分析和修正方案
 基于实际的4004 DFG文件内容设计正确的线性分析方法
 """
 
+import heapq
+import os
 import re
+import sys
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import Dict, List, Set, Tuple, Optional, Union
-import json
+from typing import Dict, List, Optional
 
 @dataclass
 class ExpressionNode:
@@ -53,9 +55,12 @@ class CorrectedLinearityAnalyzer:
     
     def analyze_dfg_file(self, file_path: str) -> Dict:
         """分析DFG文件，按表达式级别进行线性分析"""
+        # 与核心分析器共用逐行切片的Bind解析
+        from esimulator.core.dfg_parser import iter_binds
         
+        # 逐行流式提取Bind表达式，不把整个文件读入内存
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+            binds = list(iter_binds(f))
         
         print("=== 修正的DFG线性分析 ===")
         print("修正策略:")
@@ -64,18 +69,11 @@ class CorrectedLinearityAnalyzer:
         print("3. 整体判断表达式线性特征")
         print("4. 重新分类位移运算为非线性\n")
         
-        # 提取所有Bind表达式
-        bind_pattern = r'\(Bind dest:([^\s]+).*?tree:(.*?)\)(?=\n\(Bind|\nBranch:|\n\n|\Z)'
-        matches = list(re.finditer(bind_pattern, content, re.DOTALL))
-        
-        self.total_expressions = len(matches)
+        self.total_expressions = len(binds)
         print(f"找到 {self.total_expressions} 个信号表达式")
         
         # 分析每个表达式
-        for match in matches:
-            signal_name = match.group(1)
-            tree_expr = match.group(2).strip()
-            
+        for signal_name, tree_expr in binds:
             try:
                 analysis = self._analyze_signal_expression(signal_name, tree_expr)
                 self.signal_analyses[signal_name] = analysis
@@ -293,8 +291,8 @@ def analyze_real_dfg(file_name):
         print(f"  {reason}: {count}")
     
     print(f"\n运算符使用统计（前10位）:")
-    sorted_ops = sorted(report['operator_usage'].items(), key=lambda x: x[1], reverse=True)
-    for op, count in sorted_ops[:10]:
+    sorted_ops = heapq.nlargest(10, report['operator_usage'].items(), key=lambda x: x[1])
+    for op, count in sorted_ops:
         op_type = "线性" if op in analyzer.linear_operators else "非线性"
         print(f"  {op} ({op_type}): {count}")
     
@@ -330,4 +328,8 @@ def analyze_real_dfg(file_name):
     print(f"   修正报告已保存到: results/{file_name[:-4]}_linearity_analysis.txt")
 
 if __name__ == "__main__":
+    # 直接运行脚本时把项目根目录加入路径，以复用 esimulator 核心的Bind行解析
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
     analyze_real_dfg('4004_dfg.txt')
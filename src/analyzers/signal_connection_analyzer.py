@@ -4,13 +4,30 @@
 专注于分析Intel 4004 ALU中真实硬件信号之间的连接关系
 """
 
+import heapq
+import os
 import re
+import sys
 from collections import defaultdict, deque
 from dataclasses import dataclass
 from typing import Dict, List, Set, Tuple, Optional
 import json
 
-@dataclass
+# Python 3.10+ 下使用 __slots__，减少大量信号/连接对象的内存占用
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# 预编译的DFG模式：解析每个文件/表达式时不再经 re 模块缓存查找
+_TERM_RE = re.compile(r'\(Term name:(alu\.[^\s]+) type:\[(.*?)\](?:\s+msb:\(IntConst (\d+)\))?\s*(?:lsb:\(IntConst (\d+)\))?\)')
+_TERMINAL_RE = re.compile(r'Terminal\s+(alu\.[^\s)]+)')
+# 时钟相关信号名（clk / sysclk / clock），忽略大小写一次扫描
+_CLOCK_RE = re.compile(r'clk|clock', re.IGNORECASE)
+# 信号分类用的名称关键字（对小写后的信号名做一次 search，代替逐个关键字的子串判断）
+_CONTROL_NAME_RE = re.compile(r'ctrl|control|cmd')
+_STATUS_NAME_RE = re.compile(r'flag|status')
+_ARITH_NAME_RE = re.compile(r'add|sub|mul|div')
+_LOGIC_NAME_RE = re.compile(r'and|or|xor|not')
+
+@dataclass(**_DATACLASS_OPTIONS)
 class HardwareSignal:
     """硬件信号"""
     name: str
@@ -28,7 +45,7 @@ class HardwareSignal:
         """判断是否是主要硬件信号（非中间节点）"""
         return not (self.name.startswith(('const_', 'op_', 'alu.n0')) and 'Rename' not in self.signal_type)
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SignalConnection:
     """信号连接"""
     source: str
@@ -62,11 +79,10 @@ class HardwareSignalAnalyzer:
         
     def _extract_hardware_signals(self, content: str):
         """提取硬件信号定义"""
-        term_pattern = r'\(Term name:(alu\.[^\s]+) type:\[(.*?)\](?:\s+msb:\(IntConst (\d+)\))?\s*(?:lsb:\(IntConst (\d+)\))?\)'
-        
-        for match in re.finditer(term_pattern, content):
-            name = match.group(1)
-            signal_types = [t.strip().strip("'") for t in match.group(2).split(',')]
+        for match in _TERM_RE.finditer(content):
+            # 信号名与类型名在DFG中大量重复出现，驻留后共享同一个字符串对象
+            name = sys.intern(match.group(1))
+            signal_types = [sys.intern(t.strip().strip("'")) for t in match.group(2).split(',')]
             msb = int(match.group(3)) if match.group(3) else 0
             lsb = int(match.group(4)) if match.group(4) else 0
             width = msb - lsb + 1 if msb is not None else 1
@@ -76,25 +92,29 @@ class HardwareSignalAnalyzer:
     
     def _extract_signal_connections(self, content: str):
         """提取信号连接关系"""
-        # 提取Bind部分
-        bind_pattern = r'\(Bind dest:(alu\.[^\s]+)(?:[^)]*?tree:\s*(.*?))\)(?=\n\(Bind|\nBranch:|\n\n|\Z)'
+        # 与核心分析器共用逐行切片的Bind解析，不会漏掉文件末尾的Bind
+        from esimulator.core.dfg_parser import iter_binds
         
-        for match in re.finditer(bind_pattern, content, re.DOTALL):
-            dest_signal = match.group(1)
-            tree_expr = match.group(2) if match.group(2) else ""
+        for dest, tree_expr in iter_binds(content.splitlines()):
+            if not dest.startswith('alu.'):
+                continue
+            dest_signal = sys.intern(dest)
             
             # 从表达式中提取源信号
             source_signals = self._parse_expression_for_signals(tree_expr)
+            if not source_signals:
+                continue
+            
+            # 连接类型只取决于目标信号和表达式，每个Bind只判断一次
+            is_combinational = self._is_combinational_logic(dest_signal, tree_expr)
+            connection_type = 'combinational' if is_combinational else 'sequential'
             
             for source_signal in source_signals:
                 if source_signal in self.signals and source_signal != dest_signal:
-                    # 判断连接类型
-                    is_combinational = self._is_combinational_logic(dest_signal, tree_expr)
-                    
                     connection = SignalConnection(
                         source=source_signal,
                         destination=dest_signal,
-                        connection_type='combinational' if is_combinational else 'sequential',
+                        connection_type=connection_type,
                         is_combinational=is_combinational
                     )
                     self.connections.append(connection)
@@ -103,10 +123,13 @@ class HardwareSignalAnalyzer:
         """从表达式中提取信号引用"""
         signals = set()
         
+        # 常量等不含 Terminal 的表达式无需启动正则扫描
+        if 'Terminal' not in expr:
+            return signals
+        
         # 提取Terminal引用的信号
-        terminal_pattern = r'Terminal\s+(alu\.[^\s)]+)'
-        for match in re.finditer(terminal_pattern, expr):
-            signal_name = match.group(1)
+        for match in _TERMINAL_RE.finditer(expr):
+            signal_name = sys.intern(match.group(1))
             if signal_name in self.signals:
                 signals.add(signal_name)
         
@@ -127,13 +150,8 @@ class HardwareSignalAnalyzer:
         if 'Wire' in dest_types:
             return True
         
-        # 检查表达式中是否有时钟相关信号
-        clock_patterns = ['clk', 'sysclk', 'clock']
-        for pattern in clock_patterns:
-            if pattern in expr.lower():
-                return False
-        
-        return True
+        # 检查表达式中是否有时钟相关信号（单次扫描，不再为每个模式生成小写副本）
+        return _CLOCK_RE.search(expr) is None
     
     def _build_signal_graph(self):
         """构建信号图"""
@@ -145,6 +163,7 @@ class HardwareSignalAnalyzer:
         """分析信号层次结构"""
         # 执行拓扑排序获得信号层次
         topo_order = self._topological_sort()
+        level_index = {signal_name: i for i, signal_name in enumerate(topo_order)}
         
         # 创建信号分析结果
         analysis = {}
@@ -154,15 +173,13 @@ class HardwareSignalAnalyzer:
                 continue
                 
             # 计算信号层次级别
-            level = topo_order.index(signal_name) if signal_name in topo_order else -1
+            level = level_index.get(signal_name, -1)
             
-            # 直接输入信号
-            direct_inputs = [conn.source for conn in self.connections 
-                           if conn.destination == signal_name]
+            # 直接输入信号（邻接表与连接列表顺序一致，避免逐个信号扫描全部连接）
+            direct_inputs = list(self.reverse_graph.get(signal_name, ()))
             
             # 直接输出信号
-            direct_outputs = [conn.destination for conn in self.connections 
-                            if conn.source == signal_name]
+            direct_outputs = list(self.signal_graph.get(signal_name, ()))
             
             # 计算扇入扇出
             fan_in = len(direct_inputs)
@@ -216,11 +233,11 @@ class HardwareSignalAnalyzer:
         name = signal.name.lower()
         
         if 'Input' in signal_types:
-            if 'clk' in name or 'clock' in name:
+            if _CLOCK_RE.search(name):
                 return 'clock_input'
             elif 'data' in name:
                 return 'data_input'
-            elif any(x in name for x in ['ctrl', 'control', 'cmd']):
+            elif _CONTROL_NAME_RE.search(name):
                 return 'control_input'
             else:
                 return 'general_input'
@@ -228,7 +245,7 @@ class HardwareSignalAnalyzer:
         elif 'Output' in signal_types:
             if 'data' in name:
                 return 'data_output'
-            elif any(x in name for x in ['flag', 'status']):
+            elif _STATUS_NAME_RE.search(name):
                 return 'status_output'
             else:
                 return 'general_output'
@@ -244,9 +261,9 @@ class HardwareSignalAnalyzer:
                 return 'internal_register'
         
         elif 'Wire' in signal_types:
-            if any(x in name for x in ['add', 'sub', 'mul', 'div']):
+            if _ARITH_NAME_RE.search(name):
                 return 'arithmetic_wire'
-            elif any(x in name for x in ['and', 'or', 'xor', 'not']):
+            elif _LOGIC_NAME_RE.search(name):
                 return 'logic_wire'
             else:
                 return 'internal_wire'
@@ -270,9 +287,8 @@ class HardwareSignalAnalyzer:
                 if path and len(path) > 3:  # 只保留较长的路径
                     critical_paths.append(path)
         
-        # 按路径长度排序，返回最长的几条
-        critical_paths.sort(key=len, reverse=True)
-        return critical_paths[:5]
+        # 只需最长的几条：nlargest 取前5，等价于稳定排序后截取
+        return heapq.nlargest(5, critical_paths, key=len)
     
     def _find_path(self, start: str, end: str) -> Optional[List[str]]:
         """使用BFS查找两个信号之间的路径"""
@@ -402,17 +418,17 @@ def main():
         f.write("-" * 15 + "\n")
         
         # 按类别分组
+        # 复杂度（扇入+扇出）在分组时算好放在元组首位，排序比较时不再查字典
         by_category = defaultdict(list)
         for signal_name, info in detailed_analysis.items():
-            by_category[info['category']].append((signal_name, info))
+            by_category[info['category']].append((info['fan_in'] + info['fan_out'], signal_name, info))
         
         for category in sorted(by_category.keys()):
             f.write(f"\n{category.upper()} 信号:\n")
-            signals_in_category = sorted(by_category[category], 
-                                       key=lambda x: x[1]['fan_in'] + x[1]['fan_out'], 
-                                       reverse=True)
+            signals_in_category = by_category[category]
+            signals_in_category.sort(key=lambda x: x[0], reverse=True)
             
-            for signal_name, info in signals_in_category:
+            for _, signal_name, info in signals_in_category:
                 f.write(f"  {signal_name:<35}")
                 f.write(f" 扇入:{info['fan_in']:2d} 扇出:{info['fan_out']:2d}")
                 if info['direct_inputs']:
@@ -456,11 +472,11 @@ def main():
         print(f"  {category}: {count}")
     
     print(f"\n最复杂信号 (按扇入+扇出排序):")
-    complexity_ranking = [(name, info['fan_in'] + info['fan_out']) 
-                         for name, info in detailed_analysis.items()]
-    complexity_ranking.sort(key=lambda x: x[1], reverse=True)
+    complexity_ranking = heapq.nlargest(5, ((name, info['fan_in'] + info['fan_out']) 
+                                            for name, info in detailed_analysis.items()),
+                                        key=lambda x: x[1])
     
-    for signal_name, complexity in complexity_ranking[:5]:
+    for signal_name, complexity in complexity_ranking:
         info = detailed_analysis[signal_name]
         print(f"  {signal_name:<30} 复杂度:{complexity:3d} ({info['category']})")
     
@@ -474,4 +490,8 @@ def main():
     print(f"  结构化数据: 4004_signal_connections.json")
 
 if __name__ == "__main__":
+    # 直接运行脚本时把项目根目录加入路径，以复用 esimulator 核心的Bind行解析
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
     main()
@@ -4,9 +4,15 @@
 专门展示DAG的文本结构和层次关系
 """
 
+import heapq
 import json
 from collections import defaultdict, deque
 
+try:
+    import orjson  # 可选依赖：大型连接数据的解析更快
+except ImportError:
+    orjson = None
+
 class SimpleDAGAnalyzer:
     """简化的DAG分析器"""
     
@@ -15,11 +21,20 @@ class SimpleDAGAnalyzer:
         self.connections = []
         self.graph = defaultdict(list)
         self.reverse_graph = defaultdict(list)
+        self._topo_order = None  # 拓扑排序缓存，图结构变化时置空
         
     def load_data(self, json_file: str = "4004_signal_connections.json"):
         """加载数据"""
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(json_file, 'rb') as f:
+            raw = f.read()
+        data = None
+        if orjson is not None:
+            try:
+                data = orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                pass  # orjson 不接受 NaN 等扩展写法，交给标准库处理
+        if data is None:
+            data = json.loads(raw)
         
         self.signals = data['signals']
         self.connections = data['connections']
@@ -30,9 +45,13 @@ class SimpleDAGAnalyzer:
             dest = conn['destination']
             self.graph[source].append(dest)
             self.reverse_graph[dest].append(source)
+        self._topo_order = None
     
     def topological_sort(self) -> list:
-        """拓扑排序"""
+        """拓扑排序（结果在首次计算后缓存，展示与报告共用同一次遍历）"""
+        if self._topo_order is not None:
+            return self._topo_order
+        
         in_degree = defaultdict(int)
         
         # 计算入度
@@ -55,6 +74,7 @@ class SimpleDAGAnalyzer:
                 if in_degree[neighbor] == 0:
                     queue.append(neighbor)
         
+        self._topo_order = result
         return result
     
     def analyze_layers(self) -> dict:
@@ -79,8 +99,8 @@ class SimpleDAGAnalyzer:
         print("=== Intel 4004 ALU DAG结构分析 ===\n")
         
         # 基本统计
-        main_signals = [s for s in self.signals.keys() 
-                       if s.startswith('alu.') and not s.startswith('alu.n0')]
+        main_signals = {s for s in self.signals.keys() 
+                       if s.startswith('alu.') and not s.startswith('alu.n0')}
         
         print(f"信号总数: {len(self.signals)}")
         print(f"主要信号数: {len(main_signals)}")
@@ -105,7 +125,8 @@ class SimpleDAGAnalyzer:
         layers = self.analyze_layers()
         print(f"\n=== 信号层次分布 ===")
         
-        layer_keys = sorted([k for k in layers.keys() if layers[k]])[:10]  # 只显示前10层
+        # analyze_layers 按拓扑序号递增插入，键本身已有序，无需再排序
+        layer_keys = [k for k, v in layers.items() if v][:10]  # 只显示前10层
         for layer_num in layer_keys:
             signals_in_layer = layers[layer_num]
             print(f"层次 {layer_num:2d}: {len(signals_in_layer)} 个信号")
@@ -120,13 +141,13 @@ class SimpleDAGAnalyzer:
         print("=== 关键节点分析 ===")
         
         # 计算复杂度
-        complexity = [(signal, info['fan_in'] + info['fan_out']) 
-                     for signal, info in self.signals.items() 
-                     if signal.startswith('alu.') and not signal.startswith('alu.n0')]
-        complexity.sort(key=lambda x: x[1], reverse=True)
+        complexity = heapq.nlargest(10, ((signal, info['fan_in'] + info['fan_out']) 
+                                         for signal, info in self.signals.items() 
+                                         if signal.startswith('alu.') and not signal.startswith('alu.n0')),
+                                    key=lambda x: x[1])
         
         print("最复杂的10个信号（按扇入+扇出排序）:")
-        for i, (signal, comp) in enumerate(complexity[:10]):
+        for i, (signal, comp) in enumerate(complexity):
             signal_info = self.signals[signal]
             category = signal_info['category']
             fan_in = signal_info['fan_in']
@@ -166,12 +187,12 @@ class SimpleDAGAnalyzer:
             
             f.write("完整拓扑排序结果:\n")
             f.write("-" * 25 + "\n")
-            for i, signal in enumerate(main_topo):
-                signal_info = self.signals[signal]
-                category = signal_info['category']
-                fan_in = signal_info['fan_in']
-                fan_out = signal_info['fan_out']
-                f.write(f"{i+1:3d}. {signal:<30} [{category:<15}] 扇入:{fan_in:2d} 扇出:{fan_out:2d}\n")
+            signals = self.signals
+            f.writelines(
+                f"{i+1:3d}. {signal:<30} [{signals[signal]['category']:<15}] "
+                f"扇入:{signals[signal]['fan_in']:2d} 扇出:{signals[signal]['fan_out']:2d}\n"
+                for i, signal in enumerate(main_topo)
+            )
             
             # 连接关系详情
             f.write(f"\n连接关系详情:\n")
@@ -183,11 +204,10 @@ class SimpleDAGAnalyzer:
                                  not conn['source'].startswith('alu.n0') and
                                  not conn['destination'].startswith('alu.n0')]
             
-            for conn in main_connections:
-                source = conn['source']
-                dest = conn['destination']
-                conn_type = conn['type']
-                f.write(f"{source:<30} -> {dest:<30} [{conn_type}]\n")
+            f.writelines(
+                f"{conn['source']:<30} -> {conn['destination']:<30} [{conn['type']}]\n"
+                for conn in main_connections
+            )
             
             # DAG属性
             f.write(f"\nDAG属性分析:\n")
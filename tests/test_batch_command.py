@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+批量分析命令测试
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from esimulator.cli.batch_command import run_batch
+
+FIRST_DFG = """Bind:
+(Bind dest:top.x tree:(Operator Plus Next:(Terminal top.a),(IntConst 1)))
+(Bind dest:top.y tree:(Operator Times Next:(Terminal top.a),(Terminal top.b)))
+"""
+
+SECOND_DFG = """Bind:
+(Bind dest:other.z tree:(Terminal other.c))
+"""
+
+def _read_report(output_dir: str, stem: str) -> str:
+    with open(os.path.join(output_dir, f"{stem}_analysis.txt"), encoding='utf-8') as f:
+        return f.read()
+
+def _run_two_files(jobs: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        input_dir = os.path.join(tmp, 'in')
+        output_dir = os.path.join(tmp, 'out')
+        os.makedirs(input_dir)
+        for name, content in (('first_dfg.txt', FIRST_DFG), ('second_dfg.txt', SECOND_DFG)):
+            with open(os.path.join(input_dir, name), 'w', encoding='utf-8') as f:
+                f.write(content)
+
+        args = SimpleNamespace(input_dir=input_dir, output=output_dir, jobs=jobs)
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_batch(args)
+
+        first = _read_report(output_dir, 'first_dfg')
+        second = _read_report(output_dir, 'second_dfg')
+
+        # 每个文件的结果只包含自己的信号，不累积前一个文件的分析
+        assert '总表达式数: 2' in first and 'other.z' not in first
+        assert '总表达式数: 1' in second
+        assert 'other.z' in second
+        assert 'top.x' not in second and 'top.y' not in second
+
+def test_batch_results_isolated_per_file():
+    """顺序批量分析时各文件结果互不影响"""
+    _run_two_files(jobs=1)
+
+def test_batch_results_isolated_per_file_parallel():
+    """进程池并行分析时各文件结果互不影响"""
+    _run_two_files(jobs=2)
+
+if __name__ == "__main__":
+    test_batch_results_isolated_per_file()
+    test_batch_results_isolated_per_file_parallel()
+    print("批量分析测试通过")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+DFGParser 解析逻辑测试
+"""
+
+import io
+import os
+import sys
+import tempfile
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from esimulator.core.dfg_parser import DFGParser, parse_bind_line
+
+SAMPLE_DFG = """Term:
+(Term name:top.a type:['Input'] msb:(IntConst 3) lsb:(IntConst 0))
+(Term name:top.y type:['Output'] msb:(IntConst 3) lsb:(IntConst 0))
+Bind:
+(Bind dest:top.x tree:(Operator Plus Next:(Terminal top.a),(IntConst 1)))
+(Bind dest:top.y msb:(IntConst 3) lsb:(IntConst 0) tree:(Branch Cond:(Terminal top.a) True:(Terminal top.x)))
+"""
+
+def test_parse_content_extracts_binds():
+    """每个Bind行解析出目标信号与表达式树"""
+    result = DFGParser().parse_content(SAMPLE_DFG)
+    
+    assert result['total_signals'] == 2
+    assert result['signals']['top.x'] == '(Operator Plus Next:(Terminal top.a),(IntConst 1))'
+    assert result['signals']['top.y'] == '(Branch Cond:(Terminal top.a) True:(Terminal top.x))'
+
+def test_last_bind_kept_with_trailing_newline():
+    """文件末尾的换行不应导致最后一个Bind丢失"""
+    parser = DFGParser()
+    parser.parse_stream(io.StringIO(SAMPLE_DFG))
+    
+    assert parser.list_signals() == ['top.x', 'top.y']
+
+def test_parse_bind_line():
+    """单行Bind切片解析，兼容行尾\r\n；非Bind行返回None"""
+    assert parse_bind_line('(Bind dest:top.x tree:(Terminal top.a))\r\n') == ('top.x', '(Terminal top.a)')
+    assert parse_bind_line("(Term name:top.a type:['Input'])") is None
+    assert parse_bind_line('(Bind dest:top.x msb:(IntConst 3))') is None
+
+def test_expression_helpers():
+    """运算符提取与表达式类型判断"""
+    parser = DFGParser()
+    expr = '(Operator Plus Next:(Operator And Next:(Terminal a),(Terminal b)),(Terminal c))'
+    
+    assert parser.extract_operators(expr) == ['Plus', 'And']
+    assert parser.get_expression_type(expr) == 'operator'
+    assert parser.get_expression_type('(Terminal a)') == 'terminal'
+    assert parser.get_expression_type('(Partselect Var:(Terminal a))') == 'unknown'
+
+def test_parse_file_matches_parse_content():
+    """从文件解析与解析字符串内容结果一致"""
+    with tempfile.TemporaryDirectory() as tmp:
+        dfg_path = os.path.join(tmp, 'sample_dfg.txt')
+        with open(dfg_path, 'w', encoding='utf-8') as f:
+            f.write(SAMPLE_DFG)
+        
+        parser = DFGParser()
+        result = parser.parse_file(dfg_path)
+        assert result == DFGParser().parse_content(SAMPLE_DFG)
+        assert parser.get_signal_expression('top.x') == result['signals']['top.x']
+
+if __name__ == "__main__":
+    test_parse_content_extracts_binds()
+    test_last_bind_kept_with_trailing_newline()
+    test_parse_bind_line()
+    test_expression_helpers()
+    test_parse_file_matches_parse_content()
+    print("DFGParser 测试通过")
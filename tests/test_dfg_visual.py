@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+DFG 可视化指标计算测试
+"""
+
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from esimulator.visual.dfg_visual import compute_metrics
+
+def _linear_nodes(names):
+    return {n: {'is_linear': True} for n in names}
+
+def _assert_chain_consistent(metrics):
+    path = metrics['longest_linear_chain_path']
+    assert metrics['longest_linear_chain_length'] == len(path)
+    assert len(set(path)) == len(path)
+
+def test_self_loop_length_matches_path():
+    """自环不计入链长，链长与返回路径一致"""
+    nodes = _linear_nodes(['a', 'b'])
+    metrics = compute_metrics(nodes, [('a', 'a'), ('a', 'b')])
+    _assert_chain_consistent(metrics)
+    assert metrics['longest_linear_chain_path'] == ['a', 'b']
+
+def test_cycle_length_matches_path():
+    """环路上的回边被忽略，路径不会首尾相接"""
+    nodes = _linear_nodes(['a', 'b', 'c'])
+    metrics = compute_metrics(nodes, [('a', 'b'), ('b', 'c'), ('c', 'a')])
+    _assert_chain_consistent(metrics)
+    assert metrics['longest_linear_chain_length'] == 3
+
+def test_deep_chain_without_recursion_limit():
+    """超过递归上限的长链仍能算出完整路径"""
+    names = [f'n{i}' for i in range(5000)]
+    edges = list(zip(names, names[1:]))
+    metrics = compute_metrics(_linear_nodes(names), edges)
+    _assert_chain_consistent(metrics)
+    assert metrics['longest_linear_chain_path'] == names
+
+if __name__ == "__main__":
+    test_self_loop_length_matches_path()
+    test_cycle_length_matches_path()
+    test_deep_chain_without_recursion_limit()
+    print("可视化指标测试通过")
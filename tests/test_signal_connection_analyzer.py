@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+信号连接分析器测试
+"""
+
+import os
+import sys
+import tempfile
+
+# 添加项目根目录与 src/analyzers 到路径
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'src', 'analyzers'))
+
+from signal_connection_analyzer import HardwareSignalAnalyzer
+
+SAMPLE_DFG = """Term:
+(Term name:alu.a type:['Input'] msb:(IntConst 3) lsb:(IntConst 0))
+(Term name:alu.b type:['Input'] msb:(IntConst 3) lsb:(IntConst 0))
+(Term name:alu.sum type:['Wire'] msb:(IntConst 3) lsb:(IntConst 0))
+(Term name:alu.tmp type:['Reg'] msb:(IntConst 3) lsb:(IntConst 0))
+Bind:
+(Bind dest:alu.sum tree:(Operator Plus Next:(Terminal alu.a),(Terminal alu.b)))
+(Bind dest:alu.tmp tree:(Partselect Var:(Terminal alu.sum) MSB:(IntConst 3) LSB:(IntConst 0)))
+"""
+
+def _analyze(content: str) -> HardwareSignalAnalyzer:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sample_dfg.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        analyzer = HardwareSignalAnalyzer()
+        analyzer.parse_dfg(path)
+    return analyzer
+
+def test_last_bind_with_trailing_newline_has_connections():
+    """文件以换行结尾时最后一个Bind仍产生连接"""
+    analyzer = _analyze(SAMPLE_DFG)
+    edges = {(c.source, c.destination) for c in analyzer.connections}
+    assert ('alu.sum', 'alu.tmp') in edges
+    assert edges == {('alu.a', 'alu.sum'), ('alu.b', 'alu.sum'), ('alu.sum', 'alu.tmp')}
+    assert analyzer.reverse_graph['alu.tmp'] == ['alu.sum']
+
+if __name__ == "__main__":
+    test_last_bind_with_trailing_newline_has_connections()
+    print("信号连接分析测试通过")